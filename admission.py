@@ -0,0 +1,147 @@
+import logging
+import math
+import time
+from contextlib import contextmanager
+from threading import Lock, Semaphore
+
+logger = logging.getLogger(__name__)
+
+
+class Deadline:
+    """Absolute time budget for a single request, shared by every stage of it."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def budget(self, cap):
+        """Return the time a stage may spend: its own cap, bounded by the deadline."""
+        return min(cap, self.remaining())
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of being admitted."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent=3, max_queue=6, queue_timeout=10):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.slots = Semaphore(max_concurrent)
+        self.lock = Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.avg_service_time = None
+
+    def _retry_after(self):
+        """Estimate how long a shed client should wait before retrying, in seconds."""
+        service_time = self.avg_service_time or self.queue_timeout
+        backlog = self.waiting + self.in_flight
+        return max(1, math.ceil(service_time * backlog / self.max_concurrent))
+
+    def retry_after(self):
+        """Current Retry-After estimate, for callers outside the admission path."""
+        with self.lock:
+            return self._retry_after()
+
+    def _reject(self, reason):
+        with self.lock:
+            self.shed += 1
+            retry_after = self._retry_after()
+        logger.warning(f"Shedding scrape request ({reason}), retry after {retry_after}s")
+        return AdmissionRejected(reason, retry_after)
+
+    @contextmanager
+    def admit(self, deadline=None):
+        """Hold one scrape slot for the duration of the block.
+
+        Waits in the bounded queue for at most ``queue_timeout`` seconds (or
+        whatever is left of ``deadline``) and raises AdmissionRejected when
+        the queue is full or no slot frees up in time. Yields the time spent
+        queued, in seconds.
+        """
+        enqueued_at = time.monotonic()
+
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                queue_full = self.waiting >= self.max_queue
+                if not queue_full:
+                    self.waiting += 1
+            if queue_full:
+                raise self._reject('Too many requests are waiting for the scraper')
+
+            timeout = self.queue_timeout
+            if deadline is not None:
+                timeout = deadline.budget(timeout)
+            acquired = self.slots.acquire(timeout=timeout)
+            with self.lock:
+                self.waiting -= 1
+            if not acquired:
+                raise self._reject('Timed out waiting for a free scraper')
+
+        queue_wait = time.monotonic() - enqueued_at
+        with self.lock:
+            self.in_flight += 1
+            self.admitted += 1
+            self.total_queue_wait += queue_wait
+            self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+        logger.debug(f"Admitted scrape request after {queue_wait:.3f}s in queue")
+
+        started_at = time.monotonic()
+        try:
+            yield queue_wait
+        finally:
+            service_time = time.monotonic() - started_at
+            with self.lock:
+                self.in_flight -= 1
+                if self.avg_service_time is None:
+                    self.avg_service_time = service_time
+                else:
+                    # Exponentially weighted so Retry-After follows recent load
+                    self.avg_service_time = 0.8 * self.avg_service_time + 0.2 * service_time
+            self.slots.release()
+
+    def stats(self):
+        """Snapshot of queue and shedding counters."""
+        with self.lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'shed': self.shed,
+                'avg_queue_wait_ms': round(1000 * self.total_queue_wait / self.admitted, 1) if self.admitted else 0.0,
+                'max_queue_wait_ms': round(1000 * self.max_queue_wait, 1),
+                'avg_service_time_s': round(self.avg_service_time, 2) if self.avg_service_time is not None else None
+            }
+
+# Global admission controller instance
+admission_controller = None
+
+def get_admission_controller(max_concurrent=3, max_queue=6, queue_timeout=10):
+    """Get or create the global admission controller instance."""
+    global admission_controller
+    if admission_controller is None:
+        admission_controller = AdmissionController(
+            max_concurrent=max_concurrent,
+            max_queue=max_queue,
+            queue_timeout=queue_timeout
+        )
+    return admission_controller
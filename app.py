@@ -2,6 +2,9 @@ import os
 import logging
 from flask import Flask, render_template, request, jsonify
 from scraper import scrape_calendar_availability
+from admission import Deadline, AdmissionRejected, get_admission_controller
+from driver_pool import DriverPoolExhausted, POOL_SIZE
+from email_text import STYLES, is_valid_increment, render_email_text
 from urllib.parse import urlparse
 from selenium.common.exceptions import TimeoutException, WebDriverException
 import json
@@ -27,6 +30,16 @@ SUPPORTED_DOMAINS = [
     'meetings.hubspot.com'
 ]
 
+# Total time a /scrape request may take, including time spent queued
+SCRAPE_DEADLINE_SECONDS = float(os.environ.get('SCRAPE_DEADLINE_SECONDS', 60))
+
+# Admit exactly as many scrapes as there are pooled drivers, so admitted requests never queue on the pool
+admission = get_admission_controller(
+    max_concurrent=POOL_SIZE,
+    max_queue=int(os.environ.get('MAX_QUEUED_SCRAPES', 6)),
+    queue_timeout=float(os.environ.get('SCRAPE_QUEUE_TIMEOUT_SECONDS', 10))
+)
+
 def is_valid_calendar_url(url):
     try:
         parsed = urlparse(url)
@@ -79,6 +92,7 @@ def debug():
         'supported_domains': SUPPORTED_DOMAINS,
         'environment': {k: v for k, v in os.environ.items() if not k.startswith('_') and k.isupper()},
         'saved_html_files': html_files,
+        'admission': admission.stats(),
         'last_logs': last_logs
     }
 
@@ -92,6 +106,10 @@ def scrape():
         start_date = request.form.get('start_date')
         end_date = request.form.get('end_date')
         timezone = request.form.get('timezone', 'UTC')
+        requested_timeout = request.form.get('timeout')
+        max_slots = request.form.get('max_slots')
+        max_days = request.form.get('max_days')
+        text_style = request.form.get('format')
 
         logger.debug(f"Request parameters - URL: {url}, Start: {start_date}, End: {end_date}, Timezone: {timezone}")
 
@@ -105,8 +123,44 @@ def scrape():
                 'error': 'Invalid calendar URL. Supported platforms: Calendly, Outlook, HubSpot'
             }), 400
 
+        # Clients may ask for a tighter deadline than the server default, never a longer one
+        deadline_seconds = SCRAPE_DEADLINE_SECONDS
+        if requested_timeout:
+            try:
+                deadline_seconds = min(float(requested_timeout), SCRAPE_DEADLINE_SECONDS)
+            except ValueError:
+                deadline_seconds = 0
+            if not deadline_seconds > 0:
+                return jsonify({
+                    'error': 'Timeout must be a positive number of seconds'
+                }), 400
+
+        # Optional "first N slots" limits
         try:
-            result = scrape_calendar_availability(url, start_date, end_date, timezone)
+            max_slots = int(max_slots) if max_slots else None
+            max_days = int(max_days) if max_days else None
+        except ValueError:
+            return jsonify({
+                'error': 'max_slots and max_days must be whole numbers'
+            }), 400
+        if (max_slots is not None and max_slots < 1) or (max_days is not None and max_days < 1):
+            return jsonify({
+                'error': 'max_slots and max_days must be at least 1'
+            }), 400
+
+        if text_style and text_style not in STYLES:
+            return jsonify({
+                'error': f"Unknown text format. Supported formats: {', '.join(STYLES)}"
+            }), 400
+
+        deadline = Deadline(deadline_seconds)
+
+        try:
+            with admission.admit(deadline) as queue_wait:
+                result = scrape_calendar_availability(
+                    url, start_date, end_date, timezone,
+                    deadline=deadline, max_slots=max_slots, max_days=max_days
+                )
             availability = result.get('slots', [])
             increment_minutes = result.get('increment_minutes')
             errors = result.get('errors')
@@ -121,9 +175,16 @@ def scrape():
             response_data = {
                 'success': True,
                 'availability': availability,
-                'increment_minutes': increment_minutes
+                'increment_minutes': increment_minutes,
+                'queue_wait_ms': round(queue_wait * 1000),
+                'truncated': result.get('truncated', False)
             }
 
+            if text_style:
+                # A bad increment from the page is inferred from the slots instead
+                text_increment = increment_minutes if is_valid_increment(increment_minutes) else None
+                response_data['email_text'] = render_email_text(availability, text_increment, text_style)
+
             # Add timezone note if needed
             if not any(slot.get('timezone') for slot in availability):
                 response_data['note'] = f'Times shown in {timezone}'
@@ -134,8 +195,23 @@ def scrape():
                 response_data['errors'] = errors
                 response_data['note'] = 'Some dates could not be processed. See errors for details.'
 
+            if result.get('deadline_exceeded'):
+                response_data['deadline_exceeded'] = True
+                response_data['note'] = 'The request ran out of time before every date was checked. See errors for details.'
+
             return jsonify(response_data)
 
+        except AdmissionRejected as e:
+            return jsonify({
+                'error': 'The server is busy. Please try again shortly.',
+                'retry_after': e.retry_after
+            }), 429, {'Retry-After': str(e.retry_after)}
+        except DriverPoolExhausted:
+            retry_after = admission.retry_after()
+            return jsonify({
+                'error': 'All browsers are busy. Please try again shortly.',
+                'retry_after': retry_after
+            }), 503, {'Retry-After': str(retry_after)}
         except ValueError as e:
             logger.error(f"Validation error: {str(e)}")
             return jsonify({
@@ -162,5 +238,55 @@ def scrape():
             'error': 'An unexpected error occurred. Please try again later.'
         }), 500
 
+@app.route('/format', methods=['POST'])
+def format_results():
+    """Render email text for many previously fetched /scrape results in one call"""
+    try:
+        payload = request.get_json(silent=True) or {}
+        results = payload.get('results')
+        text_style = payload.get('format', 'compact')
+
+        if not isinstance(results, list):
+            return jsonify({
+                'error': 'Please provide a list of results to format'
+            }), 400
+
+        if text_style not in STYLES:
+            return jsonify({
+                'error': f"Unknown text format. Supported formats: {', '.join(STYLES)}"
+            }), 400
+
+        texts = []
+        for index, result in enumerate(results):
+            if not isinstance(result, dict) or not isinstance(result.get('availability'), list):
+                return jsonify({
+                    'error': f'Result {index} has no availability list'
+                }), 400
+            if not all(
+                isinstance(day, dict) and isinstance(day.get('date', ''), str) and isinstance(day.get('times', []), list)
+                for day in result['availability']
+            ):
+                return jsonify({
+                    'error': f'Result {index} has availability entries without a date and list of times'
+                }), 400
+            increment_minutes = result.get('increment_minutes')
+            if increment_minutes is not None and not is_valid_increment(increment_minutes):
+                return jsonify({
+                    'error': f'Result {index} increment_minutes must be a positive whole number'
+                }), 400
+            texts.append(render_email_text(result['availability'], result.get('increment_minutes'), text_style))
+
+        return jsonify({
+            'success': True,
+            'format': text_style,
+            'texts': texts
+        })
+
+    except Exception as e:
+        logger.error(f"Error formatting results: {str(e)}")
+        return jsonify({
+            'error': 'An unexpected error occurred while formatting results.'
+        }), 500
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Benchmark email text rendering on large multi-week availability results.
+
+Run from the repository root:
+
+    python benchmarks/bench_email_text.py --weeks 12 --results 50
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from email_text import STYLES, build_blocks, format_time, render_blocks, render_email_text  # noqa: E402
+
+
+def make_result(weeks, increment_minutes, seed):
+    """Build a scrape-shaped result with open slots 8 AM-6 PM and random gaps."""
+    rng = random.Random(seed)
+    availability = []
+    start = date(2025, 3, 10)
+    for offset in range(weeks * 7):
+        day = start + timedelta(days=offset)
+        times = [
+            format_time(minutes)
+            for minutes in range(8 * 60, 18 * 60, increment_minutes)
+            if rng.random() > 0.3
+        ]
+        if times:
+            availability.append({
+                'date': day.strftime('%B %-d'),
+                'times': times,
+                'timezone': 'America/New_York'
+            })
+    return {'availability': availability, 'increment_minutes': increment_minutes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--weeks', type=int, default=12, help='weeks of availability per result')
+    parser.add_argument('--results', type=int, default=50, help='number of results per bulk call')
+    parser.add_argument('--increment', type=int, default=15, help='slot increment in minutes')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    results = [make_result(args.weeks, args.increment, seed) for seed in range(args.results)]
+    slot_count = sum(len(day['times']) for result in results for day in result['availability'])
+    print(f"{args.results} results x {args.weeks} weeks, {slot_count} slots total")
+
+    def best_ms(func):
+        return min(timeit.repeat(func, number=1, repeat=args.repeat)) * 1000
+
+    merge_ms = best_ms(lambda: [build_blocks(r['availability'], r['increment_minutes']) for r in results])
+    print(f"{'merge only':<22}{merge_ms:9.2f} ms")
+
+    blocks = [build_blocks(r['availability'], r['increment_minutes']) for r in results]
+    for style in STYLES:
+        render_ms = best_ms(lambda: [render_blocks(days, style) for days in blocks])
+        full_ms = best_ms(lambda: [render_email_text(r['availability'], r['increment_minutes'], style) for r in results])
+        print(f"{style + ' render':<22}{render_ms:9.2f} ms   (merge + render {full_ms:.2f} ms)")
+
+    all_styles_ms = best_ms(lambda: [[render_blocks(days, style) for style in STYLES] for days in blocks])
+    print(f"{'all styles, shared':<22}{all_styles_ms:9.2f} ms   (blocks merged once, rendered per style)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Record HubSpot sessions and time extraction paths against them offline.
+
+Record a live session once (needs network access):
+
+    python benchmarks/bench_replay.py record https://meetings.hubspot.com/name/30min \\
+        2025-03-10 2025-03-21 --timezone America/New_York --archive /tmp/hubspot_session.zip
+
+Then compare scraping speed offline, as often as needed:
+
+    python benchmarks/bench_replay.py compare --archive /tmp/hubspot_session.zip
+
+Extraction is timed against the DOM snapshot recorded for each date, so it
+measures parsing real calendars rather than HubSpot's own page load.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from selenium.webdriver.common.by import By  # noqa: E402
+
+from driver_pool import create_chrome_driver  # noqa: E402
+from scraper import CalendarScraper  # noqa: E402
+from session_archive import SessionArchive, ReplayProxy  # noqa: E402
+
+TIME_BUTTON_SELECTOR = '[data-test-id="time-picker-btn"]'
+
+
+def extract_with_elements(driver):
+    """Current path: one WebDriver round-trip per time button."""
+    texts = (button.text.strip() for button in driver.find_elements(By.CSS_SELECTOR, TIME_BUTTON_SELECTOR))
+    return [text for text in texts if text]
+
+
+def extract_with_page_source(driver):
+    """One page_source round-trip, parsed locally with BeautifulSoup."""
+    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    texts = (button.get_text(strip=True) for button in soup.select(TIME_BUTTON_SELECTOR))
+    return [text for text in texts if text]
+
+
+# The first entry is the baseline the others are compared against
+EXTRACTORS = {
+    'elements': extract_with_elements,
+    'page_source': extract_with_page_source
+}
+
+
+def record(args):
+    scraper = CalendarScraper(args.url, record_to=args.archive)
+    started_at = time.perf_counter()
+    result = scraper.scrape(args.start_date, args.end_date, args.timezone)
+    elapsed = time.perf_counter() - started_at
+    slot_count = sum(len(day['times']) for day in result['slots'])
+    print(f"Recorded {args.start_date}..{args.end_date} in {elapsed:.2f}s ({slot_count} slots) to {args.archive}")
+
+
+def compare(args):
+    archive = SessionArchive(args.archive)
+    print(f"{args.archive}: {len(archive.pages)} dates recorded {archive.recorded_at} from {archive.url}")
+
+    # Extraction paths, timed on each date's recorded DOM
+    proxy = ReplayProxy(archive).start()
+    driver = create_chrome_driver(proxy_server=proxy.address)
+    totals = dict.fromkeys(EXTRACTORS, 0.0)
+    try:
+        for page in sorted(archive.pages, key=lambda page: page['date']):
+            driver.get(proxy.page_url(page['url']))
+            outputs = {}
+            for name, extract in EXTRACTORS.items():
+                started_at = time.perf_counter()
+                for _ in range(args.repeat):
+                    outputs[name] = extract(driver)
+                elapsed = (time.perf_counter() - started_at) / args.repeat
+                totals[name] += elapsed
+                print(f"  {page['date']}  {name:<12}{elapsed * 1000:9.2f} ms  {len(outputs[name])} slots")
+            baseline = next(iter(outputs.values()))
+            for name, output in outputs.items():
+                if output != baseline:
+                    print(f"  {page['date']}  {name} returned different slots than {next(iter(EXTRACTORS))}")
+    finally:
+        driver.quit()
+        proxy.stop()
+
+    baseline_name = next(iter(EXTRACTORS))
+    for name, total in totals.items():
+        speedup = totals[baseline_name] / total if total else float('inf')
+        print(f"{name:<14}{total * 1000:9.2f} ms total   {speedup:.1f}x vs {baseline_name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='record a live session to an archive')
+    record_parser.add_argument('url')
+    record_parser.add_argument('start_date', help='YYYY-MM-DD')
+    record_parser.add_argument('end_date', help='YYYY-MM-DD')
+    record_parser.add_argument('--timezone', default='UTC')
+    record_parser.add_argument('--archive', required=True)
+    record_parser.set_defaults(func=record)
+
+    compare_parser = subparsers.add_parser('compare', help='time extraction paths against an archive')
+    compare_parser.add_argument('--archive', required=True)
+    compare_parser.add_argument('--repeat', type=int, default=5, help='extractions per page per path')
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
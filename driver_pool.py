@@ -1,5 +1,6 @@
 import logging
-from queue import Queue
+import os
+from queue import Queue, Empty
 from threading import Lock
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -9,6 +10,55 @@ import time
 
 logger = logging.getLogger(__name__)
 
+PAGE_LOAD_TIMEOUT = 30
+
+# One driver per concurrently admitted scrape (see the admission controller in app.py)
+POOL_SIZE = int(os.environ.get('MAX_CONCURRENT_SCRAPES', 3))
+
+class DriverPoolExhausted(RuntimeError):
+    """Raised when no pooled driver frees up within the caller's time budget."""
+
+def create_chrome_driver(proxy_server=None, capture_network=False):
+    """Create a new Chrome WebDriver instance with optimized settings.
+
+    ``proxy_server`` ("host:port") routes every request through a local replay
+    proxy, whose self-signed certificate is accepted. ``capture_network``
+    enables the performance log that session recording reads responses from.
+    """
+    chrome_options = Options()
+    chrome_options.add_argument('--headless=new')  # Use new headless mode
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-images')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--disable-infobars')
+    chrome_options.add_argument('--js-flags=--max_old_space_size=256')
+    # Additional options for better headless performance
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
+    chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+
+    if proxy_server:
+        # Send all traffic through the given proxy and never fall back to a direct connection
+        chrome_options.add_argument(f'--proxy-server=http://{proxy_server}')
+        chrome_options.add_argument('--proxy-bypass-list=<-loopback>')
+        chrome_options.add_argument('--ignore-certificate-errors')
+
+    if capture_network:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    try:
+        service = Service()
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)  # Set page load timeout
+        return driver
+    except Exception as e:
+        logger.error(f"Failed to create WebDriver: {str(e)}")
+        raise
+
 class WebDriverPool:
     def __init__(self, pool_size=3, max_retries=3):
         self.pool_size = pool_size
@@ -19,30 +69,7 @@ class WebDriverPool:
 
     def _create_driver(self):
         """Create a new Chrome WebDriver instance with optimized settings."""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless=new')  # Use new headless mode
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-images')
-        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
-        chrome_options.add_argument('--disable-infobars')
-        chrome_options.add_argument('--js-flags=--max_old_space_size=256')
-        # Additional options for better headless performance
-        chrome_options.add_argument('--disable-software-rasterizer')
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-        chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-
-        try:
-            service = Service()
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            driver.set_page_load_timeout(30)  # Set page load timeout
-            return driver
-        except Exception as e:
-            logger.error(f"Failed to create WebDriver: {str(e)}")
-            raise
+        return create_chrome_driver()
 
     def _initialize_pool(self):
         """Initialize the pool with WebDriver instances."""
@@ -53,23 +80,44 @@ class WebDriverPool:
             except Exception as e:
                 logger.error(f"Failed to initialize WebDriver in pool: {str(e)}")
 
-    def get_driver(self):
-        """Get a WebDriver instance from the pool with retry logic."""
-        for attempt in range(self.max_retries):
+    def get_driver(self, timeout=None):
+        """Get a WebDriver instance from the pool with retry logic.
+
+        Without ``timeout`` each of ``max_retries`` attempts waits up to 5
+        seconds; with it, attempts continue until ``timeout`` seconds have
+        passed. Either way DriverPoolExhausted is raised if no driver frees up.
+        """
+        wait_until = time.monotonic() + timeout if timeout is not None else None
+        attempt = 0
+        while True:
+            attempt += 1
+            wait = 5  # Wait up to 5 seconds for a driver
+            if wait_until is not None:
+                wait = min(wait, max(0, wait_until - time.monotonic()))
+            try:
+                driver = self.pool.get(timeout=wait)
+            except Empty:
+                if wait_until is not None:
+                    out_of_time = time.monotonic() >= wait_until
+                else:
+                    out_of_time = attempt >= self.max_retries
+                if out_of_time:
+                    raise DriverPoolExhausted("Timed out waiting for a free WebDriver")
+                logger.warning(f"Attempt {attempt} to get driver timed out, retrying")
+                continue
+
+            # Test if the driver is still responsive
+            try:
+                driver.current_url
+                return driver
+            except WebDriverException:
+                logger.warning("Retrieved unresponsive driver, creating new one")
+                self._cleanup_driver(driver)
             try:
-                driver = self.pool.get(timeout=5)  # Wait up to 5 seconds for a driver
-                # Test if the driver is still responsive
-                try:
-                    driver.current_url
-                    return driver
-                except WebDriverException:
-                    logger.warning("Retrieved unresponsive driver, creating new one")
-                    self._cleanup_driver(driver)
-                    driver = self._create_driver()
-                    return driver
+                return self._create_driver()
             except Exception as e:
-                logger.error(f"Attempt {attempt + 1} to get driver failed: {str(e)}")
-                if attempt == self.max_retries - 1:
+                logger.error(f"Attempt {attempt} to get driver failed: {str(e)}")
+                if attempt >= self.max_retries:
                     raise RuntimeError("Failed to get WebDriver after multiple attempts")
                 time.sleep(1)  # Wait before retrying
 
@@ -78,6 +126,8 @@ class WebDriverPool:
         try:
             # Clear cookies and cache before returning to pool
             driver.delete_all_cookies()
+            # Undo any per-request page load budget
+            driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
             self.pool.put(driver, timeout=5)
         except Exception as e:
             logger.error(f"Failed to return driver to pool: {str(e)}")
@@ -102,7 +152,7 @@ class WebDriverPool:
 # Global pool instance
 driver_pool = None
 
-def get_driver_pool(pool_size=3):
+def get_driver_pool(pool_size=POOL_SIZE):
     """Get or create the global driver pool instance."""
     global driver_pool
     if driver_pool is None:
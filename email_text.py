@@ -0,0 +1,198 @@
+import logging
+import re
+from datetime import datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+STYLES = ('compact', 'bulleted', 'sentence')
+
+# Used when a result has no increment and none can be inferred from its slots
+DEFAULT_INCREMENT_MINUTES = 30
+
+MINUTES_PER_DAY = 24 * 60
+
+DATE_FORMATS = ['%B %d', '%b %d', '%A, %B %d, %Y', '%A, %B %d']
+
+_TIME_PATTERN = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*([ap])\.?m\.?\s*$', re.IGNORECASE)
+_DAY_SUFFIX_PATTERN = re.compile(r'(\d+)(st|nd|rd|th)\b')
+
+
+@lru_cache(maxsize=1024)
+def parse_time(time_str):
+    """Convert a 12-hour clock string like "9:30 AM" to minutes after midnight.
+
+    Slot lists repeat the same few dozen times every day, so results are cached.
+    """
+    match = _TIME_PATTERN.match(time_str)
+    if not match:
+        raise ValueError(f"Unrecognized time: {time_str}")
+    hour, minute, period = int(match.group(1)), int(match.group(2)), match.group(3).lower()
+    if not 1 <= hour <= 12 or minute > 59:
+        raise ValueError(f"Unrecognized time: {time_str}")
+    hour %= 12
+    if period == 'p':
+        hour += 12
+    return hour * 60 + minute
+
+
+def format_time(minutes, with_period=True):
+    """Convert minutes after midnight back to a 12-hour clock string."""
+    minutes %= MINUTES_PER_DAY
+    hour, minute = divmod(minutes, 60)
+    text = f"{hour % 12 or 12}:{minute:02d}"
+    if with_period:
+        text += ' AM' if hour < 12 else ' PM'
+    return text
+
+
+@lru_cache(maxsize=1024)
+def format_date(label):
+    """Shorten a calendar date label such as "March 10th" to "Mar 10"."""
+    cleaned = _DAY_SUFFIX_PATTERN.sub(r'\1', label.strip())
+    for date_format in DATE_FORMATS:
+        text = cleaned
+        if '%Y' not in date_format:
+            # Labels carry no year; parse in a leap year so February 29 is valid
+            text, date_format = f"{cleaned} 2000", f"{date_format} %Y"
+        try:
+            return datetime.strptime(text, date_format).strftime('%b %-d')
+        except ValueError:
+            continue
+    return label
+
+
+def _day_minutes(times):
+    """Parse a day's times in scraped order, continuing past midnight.
+
+    Timezone conversion can push a date's last slots past midnight, so a
+    time earlier than the one before it is taken to be on the next day.
+    """
+    minutes = []
+    offset = 0
+    for time_str in times:
+        try:
+            value = parse_time(time_str) + offset
+        except (ValueError, TypeError):
+            logger.warning(f"Skipping unparseable time slot: {time_str}")
+            continue
+        if minutes and value < minutes[-1]:
+            offset += MINUTES_PER_DAY
+            value += MINUTES_PER_DAY
+        if not minutes or value != minutes[-1]:
+            minutes.append(value)
+    return minutes
+
+
+def merge_slots(minutes, increment_minutes):
+    """Merge ascending slot start times into contiguous (start, end) blocks.
+
+    A slot covers ``increment_minutes`` from its start, so a slot starting
+    at or before the end of the current block extends it.
+    """
+    blocks = []
+    for start in minutes:
+        end = start + increment_minutes
+        if blocks and start <= blocks[-1][1]:
+            if end > blocks[-1][1]:
+                blocks[-1][1] = end
+        else:
+            blocks.append([start, end])
+    return [(start, end) for start, end in blocks]
+
+
+def is_valid_increment(increment_minutes):
+    """Whether a value can be used as a slot length in minutes."""
+    return isinstance(increment_minutes, int) and not isinstance(increment_minutes, bool) and increment_minutes > 0
+
+
+def _infer_increment(days):
+    """Smallest gap between consecutive slots on any day."""
+    increment = None
+    for minutes in days:
+        for previous, current in zip(minutes, minutes[1:]):
+            gap = current - previous
+            if gap > 0 and (increment is None or gap < increment):
+                increment = gap
+    return increment or DEFAULT_INCREMENT_MINUTES
+
+
+def build_blocks(availability, increment_minutes=None):
+    """Precompute merged time blocks for every day in a scrape result.
+
+    Returns a list of dicts with 'date', 'timezone' and 'blocks' keys, where
+    'blocks' is a list of (start, end) minute pairs. The result can be passed
+    to render_blocks as many times as needed, once per style.
+
+    ``increment_minutes`` must be a positive integer, or None to infer it.
+    """
+    if increment_minutes is not None and not is_valid_increment(increment_minutes):
+        raise ValueError(f"Invalid slot increment: {increment_minutes!r}")
+
+    days = []
+    for slot in availability or []:
+        minutes = _day_minutes(slot.get('times') or [])
+        if minutes:
+            days.append((slot, minutes))
+
+    if increment_minutes is None:
+        increment_minutes = _infer_increment(minutes for _, minutes in days)
+
+    return [{
+        'date': format_date(slot.get('date', '')),
+        'timezone': slot.get('timezone'),
+        'blocks': merge_slots(minutes, increment_minutes)
+    } for slot, minutes in days]
+
+
+@lru_cache(maxsize=4096)
+def _format_range(start, end, separator):
+    """Format a block, leaving the period off the start time when it matches the end."""
+    same_period = (start % MINUTES_PER_DAY < 720) == (end % MINUTES_PER_DAY < 720)
+    return f"{format_time(start, with_period=not same_period)}{separator}{format_time(end)}"
+
+
+def _join_alternatives(items):
+    if len(items) <= 2:
+        return ' or '.join(items)
+    return ', '.join(items[:-1]) + f", or {items[-1]}"
+
+
+def render_blocks(days, style='compact'):
+    """Render precomputed day blocks as email-ready text."""
+    if style == 'compact':
+        return '\n'.join(
+            f"{day['date']}: " + ', '.join(_format_range(start, end, '-') for start, end in day['blocks'])
+            for day in days
+        )
+
+    if style == 'bulleted':
+        return '\n'.join(
+            f"- {day['date']}: " + ', '.join(_format_range(start, end, ' - ') for start, end in day['blocks'])
+            for day in days
+        )
+
+    if style == 'sentence':
+        if not days:
+            return ''
+        phrases = [
+            f"{day['date']} from " + _join_alternatives([_format_range(start, end, ' to ') for start, end in day['blocks']])
+            for day in days
+        ]
+        if len(phrases) == 1:
+            text = f"I'm available {phrases[0]}."
+        else:
+            text = f"I'm available {'; '.join(phrases[:-1])}; and {phrases[-1]}."
+        timezones = {day['timezone'] for day in days if day['timezone']}
+        if len(timezones) == 1:
+            text += f" All times are {timezones.pop()}."
+        return text
+
+    raise ValueError(f"Unknown text style: {style}. Supported styles: {', '.join(STYLES)}")
+
+
+def render_email_text(availability, increment_minutes=None, style='compact'):
+    """Render a scrape result's availability as email text in the given style."""
+    if style not in STYLES:
+        raise ValueError(f"Unknown text style: {style}. Supported styles: {', '.join(STYLES)}")
+    return render_blocks(build_blocks(availability, increment_minutes), style)
@@ -1,4 +1,5 @@
 import logging
+import time
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, urlencode
@@ -11,29 +12,92 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import requests
 from zoneinfo import ZoneInfo
-from driver_pool import get_driver_pool
+from driver_pool import get_driver_pool, create_chrome_driver, DriverPoolExhausted, PAGE_LOAD_TIMEOUT
+from session_archive import SessionRecorder, SessionArchive, ReplayProxy
 import pytz
 
 logger = logging.getLogger(__name__)
 
 class CalendarScraper:
-    def __init__(self, url):
+    def __init__(self, url, record_to=None, replay_from=None):
+        """Create a scraper for a calendar URL.
+
+        ``record_to`` captures every network response, plus each date's page
+        load time and final DOM, into a session archive at that path.
+        ``replay_from`` answers Chrome's requests from such an archive, so the
+        HubSpot app runs against the recorded traffic without going online.
+        Both modes use a dedicated browser rather than one from the pool.
+        """
+        if record_to and replay_from:
+            raise ValueError("Cannot record and replay a session at the same time")
         self.url = url
         self.domain = urlparse(url).netloc.lower()
         self.driver = None
-        self.driver_pool = get_driver_pool()
+        self.driver_pool = None if record_to or replay_from else get_driver_pool()
+        self.deadline = None
+        self.recorder = SessionRecorder(record_to, url) if record_to else None
+        self.replay_archive = SessionArchive(replay_from) if replay_from else None
+        self.replay_proxy = None
+
+    def _budget(self, cap):
+        """Time a single wait may take, bounded by the request deadline if there is one."""
+        if self.deadline is None:
+            return cap
+        return self.deadline.budget(cap)
 
     def setup_driver(self):
         """Get a driver from the pool."""
+        if self.driver_pool is None:
+            self._setup_session_driver()
+            return
         try:
-            self.driver = self.driver_pool.get_driver()
+            timeout = self.deadline.remaining() if self.deadline is not None else None
+            self.driver = self.driver_pool.get_driver(timeout=timeout)
             logger.debug("Successfully obtained driver from pool")
+        except DriverPoolExhausted:
+            logger.warning("Request deadline ran out waiting for a driver from the pool")
+            raise
         except Exception as e:
             logger.error(f"Failed to get driver from pool: {str(e)}")
             raise RuntimeError(f"Failed to initialize browser: {str(e)}")
 
+    def _setup_session_driver(self):
+        """Start a dedicated browser for recording or replaying a session."""
+        try:
+            if self.replay_archive is not None:
+                self.replay_proxy = ReplayProxy(self.replay_archive).start()
+                self.driver = create_chrome_driver(proxy_server=self.replay_proxy.address)
+                logger.debug(f"Replaying session from {self.replay_archive.path}")
+            else:
+                self.driver = create_chrome_driver(capture_network=True)
+                logger.debug(f"Recording session to {self.recorder.path}")
+        except Exception as e:
+            logger.error(f"Failed to start session browser: {str(e)}")
+            self._cleanup_session_driver()
+            raise RuntimeError(f"Failed to initialize browser: {str(e)}")
+
+    def _cleanup_session_driver(self):
+        """Quit the dedicated browser, save any recording and stop the replay proxy."""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.error(f"Error during driver cleanup: {str(e)}")
+            self.driver = None
+        if self.recorder is not None and self.recorder.pages:
+            try:
+                self.recorder.save()
+            except Exception as e:
+                logger.error(f"Failed to save session archive: {str(e)}")
+        if self.replay_proxy is not None:
+            self.replay_proxy.stop()
+            self.replay_proxy = None
+
     def cleanup_driver(self):
         """Return the driver to the pool."""
+        if self.driver_pool is None:
+            self._cleanup_session_driver()
+            return
         if self.driver:
             try:
                 self.driver_pool.return_driver(self.driver)
@@ -100,8 +164,17 @@ class CalendarScraper:
             logger.error(f"Error converting time {time_str} to {target_timezone}: {str(e)}")
             return time_str  # Return original string if conversion fails
 
-    def scrape(self, start_date, end_date, timezone='UTC'):
-        """Scrape calendar availability with improved error handling."""
+    def scrape(self, start_date, end_date, timezone='UTC', deadline=None, max_slots=None, max_days=None):
+        """Scrape calendar availability with improved error handling.
+
+        When a Deadline is given, pool acquisition, page loads and element
+        waits all draw from it, and dates left unvisited when it expires are
+        reported as errors alongside the partial results.
+
+        ``max_slots`` and ``max_days`` stop the scrape as soon as that many
+        time slots or available days have been collected.
+        """
+        self.deadline = deadline
         try:
             self.setup_driver()
             timezone = self._validate_timezone(timezone)
@@ -111,7 +184,7 @@ class CalendarScraper:
             elif 'outlook.office365.com' in self.domain:
                 return self._scrape_outlook(timezone)
             elif 'meetings.hubspot.com' in self.domain:
-                return self._scrape_hubspot(start_date, end_date, timezone)
+                return self._scrape_hubspot(start_date, end_date, timezone, max_slots=max_slots, max_days=max_days)
             else:
                 raise ValueError("Unsupported calendar platform")
         except Exception as e:
@@ -152,7 +225,15 @@ class CalendarScraper:
             logger.error(f"Error calculating time increment: {str(e)}")
             return None
 
-    def _scrape_hubspot(self, start_date, end_date, timezone='UTC'):
+    def _limit_reached(self, slots, max_slots=None, max_days=None):
+        """Check whether enough slots or days have been collected to stop early."""
+        if max_days is not None and len(slots) >= max_days:
+            return True
+        if max_slots is not None and sum(len(slot['times']) for slot in slots) >= max_slots:
+            return True
+        return False
+
+    def _scrape_hubspot(self, start_date, end_date, timezone='UTC', max_slots=None, max_days=None):
         if not self.driver:
             self.setup_driver()
 
@@ -167,10 +248,20 @@ class CalendarScraper:
             # Will store all available slots across dates
             all_available_slots = []
             increment_minutes = None
+            skipped_dates = []
+            truncated = False
 
             # Loop through each date in the range
             current_date = start_obj
             while current_date <= end_obj:
+                if self.deadline is not None and self.deadline.expired():
+                    while current_date <= end_obj:
+                        skipped_dates.append(current_date.strftime('%Y-%m-%d'))
+                        current_date = current_date + timedelta(days=1)
+                    logger.warning(f"Request deadline exceeded, skipping {len(skipped_dates)} remaining dates")
+                    break
+
+                timed_out = False
                 try:
                     # Format current date for URL
                     date_formatted = current_date.strftime('%m-%d-%Y')
@@ -193,15 +284,19 @@ class CalendarScraper:
 
                     logger.debug(f"Attempting to navigate to URL: {direct_url}")
 
-                    # Load the page
+                    # Load the page (served by the replay proxy when replaying)
+                    if self.deadline is not None:
+                        self.driver.set_page_load_timeout(self._budget(PAGE_LOAD_TIMEOUT))
+                    load_started_at = time.perf_counter()
                     self.driver.get(direct_url)
 
                     # Wait for calendar elements
                     logger.debug("Waiting for calendar elements...")
-                    WebDriverWait(self.driver, 15).until(
+                    WebDriverWait(self.driver, self._budget(15)).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, 
                         '[data-test-id="time-picker-btn"], [class*="calendar"], [class*="date-picker"]'))
                     )
+                    load_seconds = time.perf_counter() - load_started_at
 
                     # Find all date buttons
                     date_buttons = self.driver.find_elements(By.CSS_SELECTOR, 
@@ -246,11 +341,12 @@ class CalendarScraper:
 
                                 # Wait for time slots to appear
                                 try:
-                                    time_buttons = WebDriverWait(self.driver, 5).until(
+                                    time_buttons = WebDriverWait(self.driver, self._budget(5)).until(
                                         EC.presence_of_all_elements_located((By.CSS_SELECTOR, '[data-test-id="time-picker-btn"]'))
                                     )
                                 except TimeoutException:
                                     logger.warning(f"No time slots appeared for {target_month_day} after clicking")
+                                    timed_out = True
                                     target_found = True  # Mark as found but skip processing
                                     break
 
@@ -285,22 +381,54 @@ class CalendarScraper:
                     if not target_found:
                         logger.warning(f"Date {target_month_day} not found in calendar")
 
+                    if self.recorder is not None:
+                        self.recorder.record_page(current_date.strftime('%Y-%m-%d'), direct_url, self.driver, load_seconds)
+
+                except TimeoutException as e:
+                    logger.error(f"Timed out processing date {current_date.strftime('%Y-%m-%d')}: {str(e)}")
+                    timed_out = True
                 except Exception as e:
                     logger.error(f"Error processing date {current_date.strftime('%Y-%m-%d')}: {str(e)}")
 
+                # A load or wait cut short by the deadline means this date was never really checked
+                if timed_out and self.deadline is not None and self.deadline.expired():
+                    skipped_dates.append(current_date.strftime('%Y-%m-%d'))
+
+                # Stop early once the requested number of slots or days is collected
+                if self._limit_reached(all_available_slots, max_slots, max_days):
+                    truncated = current_date < end_obj
+                    logger.info(f"Collected requested slots, stopping at {current_date.strftime('%Y-%m-%d')}")
+                    break
+
                 # Move to next date
                 current_date = current_date + timedelta(days=1)
 
+            # Drop slots beyond max_slots from the last day collected
+            if max_slots is not None and all_available_slots:
+                excess = sum(len(slot['times']) for slot in all_available_slots) - max_slots
+                if excess > 0:
+                    last_day = all_available_slots[-1]
+                    last_day['times'] = last_day['times'][:-excess]
+                    truncated = True
+
             if not all_available_slots:
+                if skipped_dates:
+                    raise TimeoutException("Request deadline exceeded before any slots were found")
                 error_msg = f"No available slots found between {start_date} and {end_date}"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
 
             # Add increment information to the response
-            return {
+            result = {
                 'increment_minutes': increment_minutes,
-                'slots': all_available_slots
+                'slots': all_available_slots,
+                'truncated': truncated
             }
+            if skipped_dates:
+                result['partial_success'] = True
+                result['deadline_exceeded'] = True
+                result['errors'] = [f"Request deadline exceeded before checking {date}" for date in skipped_dates]
+            return result
 
         except TimeoutException as e:
             logger.error(f"Timeout waiting for calendar elements: {str(e)}")
@@ -440,11 +568,12 @@ class CalendarScraper:
             ]
 
 
-def scrape_calendar_availability(url, start_date, end_date, timezone='UTC'):
-    scraper = CalendarScraper(url)
+def scrape_calendar_availability(url, start_date, end_date, timezone='UTC', deadline=None, max_slots=None, max_days=None,
+                                 record_to=None, replay_from=None):
+    scraper = CalendarScraper(url, record_to=record_to, replay_from=replay_from)
     try:
         logger.info(f"Starting calendar scraping for {url}")
-        return scraper.scrape(start_date, end_date, timezone)
+        return scraper.scrape(start_date, end_date, timezone, deadline=deadline, max_slots=max_slots, max_days=max_days)
     except Exception as e:
         logger.error(f"Error in scraper: {str(e)}")
         raise
\ No newline at end of file
@@ -0,0 +1,326 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import ssl
+import subprocess
+import tempfile
+import zipfile
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from urllib.parse import urlsplit, quote, parse_qs
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 2
+
+REPLAY_PATH = '/__replay__'
+
+_SCRIPT_PATTERN = re.compile(r'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+# Recorded bodies are stored decoded, and the proxy sets its own framing
+_SKIPPED_HEADERS = {
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection',
+    'keep-alive', 'alt-svc', 'strict-transport-security'
+}
+
+
+def _url_key(url):
+    """Key a URL by host, path and query."""
+    parts = urlsplit(url)
+    key = parts.netloc.lower() + (parts.path or '/')
+    if parts.query:
+        key += '?' + parts.query
+    return key
+
+
+def _path_key(url):
+    """Key a URL by host and path only, for requests whose query changes per run."""
+    parts = urlsplit(url)
+    return parts.netloc.lower() + (parts.path or '/')
+
+
+class SessionRecorder:
+    """Collect page loads, network responses and DOM snapshots from a live session.
+
+    Archives are zip files holding a manifest.json plus one file per distinct
+    response body or DOM snapshot, so repeated assets are stored once.
+    Responses are read from Chrome's performance log, so the driver must be
+    created with ``capture_network=True``.
+    """
+
+    def __init__(self, path, url):
+        self.path = path
+        self.url = url
+        self.pages = []
+        self.responses = {}
+        self.files = {}
+        self._methods = {}
+
+    def _store(self, folder, data):
+        name = f'{folder}/{hashlib.sha1(data).hexdigest()}'
+        self.files[name] = data
+        return name
+
+    def _add_response(self, method, response, body):
+        headers = response.get('headers') or {}
+        self.responses[(method, _url_key(response['url']))] = {
+            'method': method,
+            'url': response['url'],
+            'status': response.get('status', 200),
+            'headers': {name: value for name, value in headers.items() if name.lower() not in _SKIPPED_HEADERS},
+            'body': self._store('bodies', body)
+        }
+
+    def _collect_network(self, driver):
+        """Drain the performance log and record every response seen since the last call."""
+        try:
+            entries = driver.get_log('performance')
+        except WebDriverException as e:
+            logger.warning(f"Could not read performance log: {str(e)}")
+            return
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+                method_name = message.get('method')
+                params = message.get('params', {})
+
+                if method_name == 'Network.requestWillBeSent':
+                    request_id = params['requestId']
+                    # Redirects never get a responseReceived of their own
+                    redirect = params.get('redirectResponse')
+                    if redirect and redirect['url'].startswith('http'):
+                        self._add_response(self._methods.get(request_id, 'GET'), redirect, b'')
+                    self._methods[request_id] = params['request'].get('method', 'GET')
+
+                elif method_name == 'Network.responseReceived':
+                    response = params['response']
+                    if not response['url'].startswith('http'):
+                        continue
+                    body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+                    if body.get('base64Encoded'):
+                        data = base64.b64decode(body['body'])
+                    else:
+                        data = body['body'].encode('utf-8')
+                    self._add_response(self._methods.get(params['requestId'], 'GET'), response, data)
+            except WebDriverException:
+                # Bodies of evicted or still-streaming resources are not retrievable
+                continue
+            except (KeyError, ValueError) as e:
+                logger.debug(f"Skipping malformed performance log entry: {str(e)}")
+                continue
+
+    def record_page(self, date_key, url, driver, load_seconds):
+        """Record the network traffic, load time and current DOM for one date's page."""
+        self._collect_network(driver)
+        html = driver.page_source.encode('utf-8')
+        self.pages.append({
+            'date': date_key,
+            'url': url,
+            'load_seconds': round(load_seconds, 3),
+            'snapshot': self._store('snapshots', html)
+        })
+        logger.debug(f"Recorded {date_key}: {len(html)} bytes of DOM, {len(self.responses)} responses so far")
+
+    def save(self):
+        """Write the archive to disk."""
+        manifest = {
+            'version': ARCHIVE_VERSION,
+            'url': self.url,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'pages': self.pages,
+            'responses': list(self.responses.values())
+        }
+        with zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('manifest.json', json.dumps(manifest, indent=2))
+            for name, data in self.files.items():
+                archive.writestr(name, data)
+        logger.info(f"Saved session archive with {len(self.pages)} pages and {len(self.responses)} responses to {self.path}")
+
+
+class SessionArchive:
+    """Read-only view of an archive written by SessionRecorder."""
+
+    def __init__(self, path):
+        self.path = path
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read('manifest.json'))
+            if manifest.get('version') != ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported session archive version: {manifest.get('version')}")
+            self.files = {name: archive.read(name) for name in archive.namelist() if name != 'manifest.json'}
+        self.url = manifest['url']
+        self.recorded_at = manifest.get('recorded_at')
+        self.pages = manifest['pages']
+        self.responses = manifest['responses']
+        self._pages_by_url = {_url_key(page['url']): page for page in self.pages}
+        self._responses_by_url = {(r['method'], _url_key(r['url'])): r for r in self.responses}
+        self._responses_by_path = {(r['method'], _path_key(r['url'])): r for r in self.responses}
+
+    def response(self, method, url):
+        """Recorded (status, headers, body) for a request, or None.
+
+        Falls back to matching host and path alone, so cache-busting query
+        parameters that differ between runs still find their response.
+        """
+        response = (self._responses_by_url.get((method, _url_key(url)))
+                    or self._responses_by_path.get((method, _path_key(url))))
+        if response is None:
+            return None
+        return response['status'], response['headers'], self.files[response['body']]
+
+    def snapshot(self, url):
+        """DOM snapshot recorded for a page URL, with scripts removed so it stays static."""
+        page = self._pages_by_url.get(_url_key(url))
+        if page is None:
+            return None
+        html = self.files[page['snapshot']].decode('utf-8')
+        return _SCRIPT_PATTERN.sub('', html)
+
+
+def _self_signed_context():
+    """TLS server context with a throwaway certificate, generated with the openssl CLI.
+
+    Chrome is started with --ignore-certificate-errors during replay, so one
+    certificate serves every host.
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path = os.path.join(directory, 'replay.crt')
+        key_path = os.path.join(directory, 'replay.key')
+        subprocess.run([
+            'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+            '-subj', '/CN=session-replay', '-keyout', key_path, '-out', cert_path
+        ], check=True, capture_output=True)
+        context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+class ReplayProxy:
+    """Local proxy that answers Chrome from a SessionArchive instead of the network.
+
+    HTTPS tunnels are terminated here and the requests inside them, like
+    plain HTTP ones, are answered with the recorded response for that method
+    and URL. Anything that was not recorded gets a 404, so replays never go
+    online. page_url() additionally serves a page's static DOM snapshot.
+    """
+
+    def __init__(self, archive, host='127.0.0.1', port=0):
+        self.archive = archive
+        self.ssl_context = _self_signed_context()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+        self.served = 0
+        self.missed = 0
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def page_url(self, url):
+        """URL that makes the proxy serve the recorded DOM snapshot of ``url``."""
+        return f"http://{self.address}{REPLAY_PATH}?url={quote(url, safe='')}"
+
+    def start(self):
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.debug(f"Replay proxy for {self.archive.path} listening on {self.address}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        logger.debug(f"Replay proxy stopped after serving {self.served} requests ({self.missed} not in archive)")
+
+    def _make_handler(self):
+        proxy = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            tunnel_host = None
+
+            def _request_url(self):
+                if self.tunnel_host:
+                    return f"https://{self.tunnel_host}{self.path}"
+                # Proxied requests carry the full URL, direct ones only the path
+                if urlsplit(self.path).netloc:
+                    return self.path
+                return f"http://{self.headers.get('Host', proxy.address)}{self.path}"
+
+            def _send(self, status, headers, body):
+                self.send_response(status)
+                for name, value in headers.items():
+                    # DevTools joins repeated headers with newlines
+                    for line in str(value).split('\n'):
+                        self.send_header(name, line)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def _replay(self):
+                # One request per connection keeps tunnel teardown simple
+                self.close_connection = True
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)  # Responses are matched by method and URL only
+
+                url = self._request_url()
+                parts = urlsplit(url)
+                if not self.tunnel_host and parts.path == REPLAY_PATH and parts.netloc == proxy.address:
+                    html = proxy.archive.snapshot(parse_qs(parts.query).get('url', [''])[0])
+                    if html is not None:
+                        proxy.served += 1
+                        return self._send(200, {'Content-Type': 'text/html; charset=utf-8'}, html.encode('utf-8'))
+                else:
+                    response = proxy.archive.response(self.command, url)
+                    if response is not None:
+                        proxy.served += 1
+                        return self._send(*response)
+                    if self.command == 'OPTIONS':
+                        # CORS preflights are not in the performance log; allow whatever was asked
+                        proxy.served += 1
+                        return self._send(204, {
+                            'Access-Control-Allow-Origin': self.headers.get('Origin', '*'),
+                            'Access-Control-Allow-Credentials': 'true',
+                            'Access-Control-Allow-Methods': self.headers.get('Access-Control-Request-Method', 'GET'),
+                            'Access-Control-Allow-Headers': self.headers.get('Access-Control-Request-Headers', '*')
+                        }, b'')
+
+                proxy.missed += 1
+                logger.debug(f"Replay proxy: no recorded response for {self.command} {url}")
+                self.send_error(404, 'Not recorded in session archive')
+
+            do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _replay
+
+            def do_CONNECT(self):
+                host, _, port = self.path.rpartition(':')
+                self.send_response(200, 'Connection Established')
+                self.end_headers()
+                try:
+                    tls = proxy.ssl_context.wrap_socket(self.connection, server_side=True)
+                except (ssl.SSLError, OSError) as e:
+                    logger.debug(f"Replay proxy: TLS handshake for {self.path} failed: {str(e)}")
+                    self.close_connection = True
+                    return
+                # Keep reading requests, now from inside the tunnel
+                self.connection = tls
+                self.rfile = tls.makefile('rb')
+                self.wfile = tls.makefile('wb')
+                self.tunnel_host = host if port == '443' else self.path
+                self.close_connection = False
+
+            def finish(self):
+                super().finish()
+                if self.tunnel_host:
+                    self.connection.close()
+
+            def log_message(self, format, *args):
+                logger.debug(f"Replay proxy: {format % args}")
+
+        return ReplayHandler
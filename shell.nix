@@ -9,6 +9,7 @@ pkgs.mkShell {
     python311Packages.selenium
     python311Packages.pytz
     python311Packages.gunicorn
+    openssl
   ];
 
   shellHook = ''
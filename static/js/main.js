@@ -173,6 +173,7 @@ document.addEventListener('DOMContentLoaded', function() {
         submitBtn.disabled = true;
 
         const formData = new FormData(form);
+        formData.append('format', 'compact');
 
         try {
             const response = await fetch('/scrape', {
@@ -196,7 +197,8 @@ document.addEventListener('DOMContentLoaded', function() {
             timezoneInfo.textContent = infoText.join(' • ');
 
             // Display results
-            availabilityText.textContent = formatAvailability(data.availability, data.increment_minutes);
+            // Prefer the server-rendered text, fall back to formatting locally
+            availabilityText.textContent = data.email_text || formatAvailability(data.availability, data.increment_minutes);
             resultDiv.classList.remove('d-none');
         } catch (error) {
             errorDiv.textContent = error.message;
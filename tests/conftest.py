@@ -0,0 +1,89 @@
+import time
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+import scraper
+from app import app
+
+TIME_PICKER_SELECTOR = '[data-test-id="time-picker-btn"]'
+
+
+class StubElement:
+    def __init__(self, text='', **attributes):
+        self.text = text
+        self.attributes = attributes
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class StubHubSpotDriver:
+    """Just enough of a HubSpot booking page for CalendarScraper._scrape_hubspot.
+
+    ``times_by_date`` maps 'YYYY-MM-DD' to the times shown after clicking that
+    date; dates missing from it are shown disabled. Every page load takes
+    ``load_seconds`` and fails like Chrome does when that exceeds the page
+    load timeout.
+    """
+
+    def __init__(self, times_by_date, load_seconds=0):
+        self.times_by_date = times_by_date
+        self.load_seconds = load_seconds
+        self.page_load_timeout = 30
+        self.loaded = []
+        self.date = None
+        self.clicked = False
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def get(self, url):
+        date = datetime.strptime(parse_qs(urlsplit(url).query)['date'][0], '%m-%d-%Y')
+        time.sleep(min(self.load_seconds, self.page_load_timeout))
+        if self.load_seconds > self.page_load_timeout:
+            raise TimeoutException('Timed out receiving message from renderer')
+        self.date = date
+        self.clicked = False
+        self.loaded.append(date.strftime('%Y-%m-%d'))
+
+    def find_element(self, by, selector):
+        return StubElement()
+
+    def find_elements(self, by, selector):
+        times = self.times_by_date.get(self.date.strftime('%Y-%m-%d'))
+        if selector == TIME_PICKER_SELECTOR:
+            return [StubElement(text) for text in times] if self.clicked and times else []
+        label = self.date.strftime('%B %-d')
+        return [StubElement(label, **{'aria-label': label, 'disabled': None if times else 'true'})]
+
+    def execute_script(self, script, element):
+        self.clicked = True
+
+
+class StubPool:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get_driver(self, timeout=None):
+        return self.driver
+
+    def return_driver(self, driver):
+        pass
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.fixture
+def use_driver(monkeypatch):
+    """Make every CalendarScraper draw the given driver (or pool) instead of Chrome."""
+    def use(driver_or_pool):
+        pool = driver_or_pool if hasattr(driver_or_pool, 'get_driver') else StubPool(driver_or_pool)
+        monkeypatch.setattr(scraper, 'get_driver_pool', lambda: pool)
+        return driver_or_pool
+    return use
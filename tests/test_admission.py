@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from admission import AdmissionController, AdmissionRejected, Deadline
+from driver_pool import DriverPoolExhausted, WebDriverPool
+
+SCRAPE_FORM = {
+    'url': 'https://meetings.hubspot.com/name/30min',
+    'start_date': '2025-03-10',
+    'end_date': '2025-03-10'
+}
+
+
+class EmptyPool(WebDriverPool):
+    """A pool whose drivers are all checked out, without starting Chrome."""
+
+    def _initialize_pool(self):
+        pass
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition never became true'
+        time.sleep(0.01)
+
+
+def test_full_queue_sheds_with_429(client, monkeypatch):
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(app_module, 'admission', controller)
+
+    with controller.admit():
+        response = client.post('/scrape', data=SCRAPE_FORM)
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert controller.stats()['shed'] == 1
+
+
+def test_queue_timeout_sheds():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.1)
+
+    with controller.admit():
+        with pytest.raises(AdmissionRejected):
+            with controller.admit():
+                pass
+
+    assert controller.stats()['shed'] == 1
+
+
+def test_deadline_bounds_queue_wait():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=10)
+
+    started_at = time.monotonic()
+    with controller.admit():
+        with pytest.raises(AdmissionRejected):
+            with controller.admit(Deadline(0.1)):
+                pass
+
+    assert time.monotonic() - started_at < 1
+
+
+def test_stats_counters():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5)
+    queued = []
+
+    def queue_one():
+        with controller.admit() as queue_wait:
+            queued.append(queue_wait)
+
+    with controller.admit():
+        waiter = threading.Thread(target=queue_one)
+        waiter.start()
+        wait_for(lambda: controller.stats()['waiting'] == 1)
+        assert controller.stats()['in_flight'] == 1
+
+        # The single queue spot is taken, so this one is shed immediately
+        with pytest.raises(AdmissionRejected):
+            with controller.admit():
+                pass
+        assert controller.stats()['shed'] == 1
+
+    waiter.join()
+    stats = controller.stats()
+    assert (stats['admitted'], stats['in_flight'], stats['waiting'], stats['shed']) == (2, 0, 0, 1)
+    assert queued[0] > 0
+
+
+def test_pool_keeps_waiting_until_timeout():
+    pool = EmptyPool(pool_size=1)
+
+    started_at = time.monotonic()
+    with pytest.raises(DriverPoolExhausted):
+        pool.get_driver(timeout=1)
+
+    assert time.monotonic() - started_at >= 1
+
+
+def test_exhausted_pool_returns_503(client, use_driver):
+    use_driver(EmptyPool(pool_size=1))
+
+    response = client.post('/scrape', data=dict(SCRAPE_FORM, timeout='0.3'))
+
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
@@ -0,0 +1,59 @@
+import pytest
+
+from conftest import StubHubSpotDriver
+
+AVAILABILITY = [{'date': 'March 10th', 'times': ['9:00 AM', '9:30 AM'], 'timezone': 'UTC'}]
+
+
+def test_format_renders_each_result(client):
+    response = client.post('/format', json={
+        'results': [{'availability': AVAILABILITY, 'increment_minutes': 30}, {'availability': AVAILABILITY}],
+        'format': 'compact'
+    })
+    assert response.status_code == 200
+    assert response.json['texts'] == ['Mar 10: 9:00-10:00 AM', 'Mar 10: 9:00-10:00 AM']
+
+
+@pytest.mark.parametrize('result', [
+    {'availability': AVAILABILITY, 'increment_minutes': '30'},
+    {'availability': AVAILABILITY, 'increment_minutes': 0},
+    {'availability': AVAILABILITY, 'increment_minutes': -30},
+    {'availability': ['March 10']},
+    {'availability': [{'date': 'March 10', 'times': '9:00 AM'}]},
+    {'availability': [{'date': 10, 'times': []}]},
+    {}
+])
+def test_format_rejects_bad_results(client, result):
+    response = client.post('/format', json={'results': [result]})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('limits', [
+    {'max_slots': '0'},
+    {'max_days': '-1'},
+    {'max_slots': 'five'},
+    {'max_days': '2.5'}
+])
+def test_scrape_rejects_bad_limits(client, limits):
+    response = client.post('/scrape', data=dict({
+        'url': 'https://meetings.hubspot.com/name/30min',
+        'start_date': '2025-03-10',
+        'end_date': '2025-03-12'
+    }, **limits))
+    assert response.status_code == 400
+
+
+def test_scrape_reports_truncation(client, use_driver):
+    use_driver(StubHubSpotDriver({'2025-03-10': ['9:00 am', '9:30 am'], '2025-03-11': ['9:00 am']}))
+
+    response = client.post('/scrape', data={
+        'url': 'https://meetings.hubspot.com/name/30min',
+        'start_date': '2025-03-10',
+        'end_date': '2025-03-11',
+        'timezone': 'America/New_York',
+        'max_slots': '1'
+    })
+
+    assert response.status_code == 200
+    assert response.json['truncated'] is True
+    assert response.json['availability'][0]['times'] == ['9:00 AM']
@@ -0,0 +1,68 @@
+import pytest
+
+from email_text import build_blocks, format_date, merge_slots, parse_time, render_blocks, render_email_text
+
+
+def test_parse_time():
+    assert parse_time('12:00 AM') == 0
+    assert parse_time('9:30 am') == 570
+    assert parse_time('12:15 PM') == 735
+    assert parse_time('11:45 PM') == 1425
+    with pytest.raises(ValueError):
+        parse_time('13:00 PM')
+
+
+def test_merge_slots():
+    assert merge_slots([540, 570, 600, 720], 30) == [(540, 630), (720, 750)]
+
+
+def test_block_crossing_noon_keeps_both_periods():
+    availability = [{'date': 'March 10th', 'times': ['11:00 AM', '11:30 AM', '12:00 PM']}]
+    assert render_email_text(availability, 30) == 'Mar 10: 11:00 AM-12:30 PM'
+
+
+def test_slot_crossing_midnight():
+    availability = [{'date': 'March 10', 'times': ['11:30 PM']}]
+    assert render_email_text(availability, 60) == 'Mar 10: 11:30 PM-12:30 AM'
+
+
+def test_inferred_increment():
+    availability = [{'date': 'March 10', 'times': ['9:00 AM', '9:15 AM', '9:30 AM', '10:00 AM']}]
+    assert render_email_text(availability) == 'Mar 10: 9:00-9:45 AM, 10:00-10:15 AM'
+
+
+def test_unparseable_times_are_skipped():
+    availability = [
+        {'date': 'March 10', 'times': ['Time information not available', '2:00 PM']},
+        {'date': 'March 11', 'times': ['No available times']}
+    ]
+    assert render_email_text(availability, 30) == 'Mar 10: 2:00-2:30 PM'
+
+
+def test_styles():
+    days = build_blocks([
+        {'date': 'March 10th', 'times': ['9:00 AM', '9:30 AM', '2:00 PM'], 'timezone': 'America/New_York'},
+        {'date': 'March 11th', 'times': ['10:00 AM'], 'timezone': 'America/New_York'}
+    ], 30)
+    assert render_blocks(days, 'compact') == 'Mar 10: 9:00-10:00 AM, 2:00-2:30 PM\nMar 11: 10:00-10:30 AM'
+    assert render_blocks(days, 'bulleted') == '- Mar 10: 9:00 - 10:00 AM, 2:00 - 2:30 PM\n- Mar 11: 10:00 - 10:30 AM'
+    assert render_blocks(days, 'sentence') == (
+        "I'm available Mar 10 from 9:00 to 10:00 AM or 2:00 to 2:30 PM; "
+        "and Mar 11 from 10:00 to 10:30 AM. All times are America/New_York."
+    )
+
+
+@pytest.mark.parametrize('increment', [0, -15, '30', True])
+def test_invalid_increment_rejected(increment):
+    with pytest.raises(ValueError):
+        build_blocks([{'date': 'March 10', 'times': ['9:00 AM']}], increment)
+
+
+def test_late_slots_pushed_past_midnight_stay_in_one_block():
+    availability = [{'date': 'March 10', 'times': ['10:00 PM', '11:00 PM', '12:00 AM']}]
+    assert render_email_text(availability, 60) == 'Mar 10: 10:00 PM-1:00 AM'
+
+
+def test_leap_day_label():
+    assert format_date('February 29th') == 'Feb 29'
+    assert format_date('Saturday, February 29, 2020') == 'Feb 29'
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from admission import Deadline
+from conftest import StubHubSpotDriver
+from scraper import CalendarScraper
+
+URL = 'https://meetings.hubspot.com/name/30min'
+
+
+def test_deadline_reports_skipped_dates(use_driver):
+    # The first load fits the deadline, the second is cut short by it
+    driver = use_driver(StubHubSpotDriver({
+        '2025-03-10': ['9:00 am', '9:30 am'],
+        '2025-03-11': ['9:00 am'],
+        '2025-03-12': ['9:00 am']
+    }, load_seconds=0.2))
+
+    result = CalendarScraper(URL).scrape('2025-03-10', '2025-03-12', 'America/New_York', deadline=Deadline(0.3))
+
+    assert driver.loaded == ['2025-03-10']
+    assert [day['date'] for day in result['slots']] == ['March 10']
+    assert result['deadline_exceeded'] is True
+    assert result['errors'] == [
+        'Request deadline exceeded before checking 2025-03-11',
+        'Request deadline exceeded before checking 2025-03-12'
+    ]
+
+
+def test_checked_dates_are_not_reported_as_skipped(use_driver):
+    # The only date is fully checked (it is disabled), but the check outlasts the deadline
+    class SlowCalendarDriver(StubHubSpotDriver):
+        def find_elements(self, by, selector):
+            time.sleep(0.2)
+            return super().find_elements(by, selector)
+
+    use_driver(SlowCalendarDriver({}))
+
+    with pytest.raises(ValueError, match='No available slots'):
+        CalendarScraper(URL).scrape('2025-03-11', '2025-03-11', 'America/New_York', deadline=Deadline(0.1))
+
+
+THREE_DAYS = {
+    '2025-03-10': ['9:00 am', '9:30 am', '10:00 am'],
+    '2025-03-11': ['9:00 am', '9:30 am', '10:00 am'],
+    '2025-03-12': ['9:00 am', '9:30 am', '10:00 am']
+}
+
+
+def test_max_slots_trims_last_day(use_driver):
+    driver = use_driver(StubHubSpotDriver(THREE_DAYS))
+
+    result = CalendarScraper(URL).scrape('2025-03-10', '2025-03-12', 'America/New_York', max_slots=4)
+
+    assert driver.loaded == ['2025-03-10', '2025-03-11']
+    assert [day['times'] for day in result['slots']] == [['9:00 AM', '9:30 AM', '10:00 AM'], ['9:00 AM']]
+    assert result['truncated'] is True
+
+
+def test_max_days_stops_early(use_driver):
+    driver = use_driver(StubHubSpotDriver(THREE_DAYS))
+
+    result = CalendarScraper(URL).scrape('2025-03-10', '2025-03-12', 'America/New_York', max_days=1)
+
+    assert driver.loaded == ['2025-03-10']
+    assert len(result['slots']) == 1
+    assert result['truncated'] is True
+
+
+def test_limit_reached_on_end_date_is_not_truncated(use_driver):
+    driver = use_driver(StubHubSpotDriver(THREE_DAYS))
+
+    result = CalendarScraper(URL).scrape('2025-03-10', '2025-03-12', 'America/New_York', max_slots=9, max_days=3)
+
+    assert driver.loaded == ['2025-03-10', '2025-03-11', '2025-03-12']
+    assert sum(len(day['times']) for day in result['slots']) == 9
+    assert result['truncated'] is False
@@ -0,0 +1,156 @@
+import base64
+import json
+import ssl
+import urllib.error
+import urllib.request
+
+import pytest
+
+from session_archive import ReplayProxy, SessionArchive, SessionRecorder
+
+PAGE_URL = 'https://meetings.hubspot.com/name/30min?date=03-10-2025&timezone=UTC'
+PAGE_SOURCE = (
+    '<html><head><script>window.app = {};</script></head>'
+    '<body><button data-test-id="time-picker-btn">9:00 am</button></body></html>'
+)
+REPLAYED_HTML = b'<html><head></head><body><button data-test-id="time-picker-btn">9:00 am</button></body></html>'
+API_URL = 'https://api.hubspot.com/meetings-public/v1/book/availability-page?slug=name&_=1700000000'
+API_BODY = b'{"slots": ["9:00 am"]}'
+LOGO_BYTES = bytes(range(256))
+
+
+def log_entry(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class StubDriver:
+    """Driver whose performance log holds one page load, an API call, a redirect and an image."""
+
+    page_source = PAGE_SOURCE
+
+    def __init__(self):
+        self.bodies = {
+            'page': {'body': PAGE_SOURCE, 'base64Encoded': False},
+            'api': {'body': API_BODY.decode(), 'base64Encoded': False},
+            'logo': {'body': base64.b64encode(LOGO_BYTES).decode(), 'base64Encoded': True}
+        }
+
+    def get_log(self, log_type):
+        return [
+            log_entry('Network.requestWillBeSent', requestId='page', request={'url': PAGE_URL, 'method': 'GET'}),
+            log_entry('Network.responseReceived', requestId='page', response={
+                'url': PAGE_URL, 'status': 200, 'headers': {'content-type': 'text/html', 'content-encoding': 'gzip'}
+            }),
+            log_entry('Network.requestWillBeSent', requestId='api', request={'url': API_URL, 'method': 'GET'}),
+            log_entry('Network.responseReceived', requestId='api', response={
+                'url': API_URL, 'status': 200, 'headers': {
+                    'content-type': 'application/json',
+                    'access-control-allow-origin': 'https://meetings.hubspot.com',
+                    'set-cookie': 'a=1\nb=2'
+                }
+            }),
+            log_entry('Network.requestWillBeSent', requestId='logo',
+                      request={'url': 'https://static.hsappstatic.net/old-logo.png', 'method': 'GET'}),
+            log_entry('Network.requestWillBeSent', requestId='logo',
+                      request={'url': 'https://static.hsappstatic.net/logo.png', 'method': 'GET'},
+                      redirectResponse={'url': 'https://static.hsappstatic.net/old-logo.png', 'status': 301,
+                                        'headers': {'location': 'https://static.hsappstatic.net/logo.png'}}),
+            log_entry('Network.responseReceived', requestId='logo', response={
+                'url': 'https://static.hsappstatic.net/logo.png', 'status': 200, 'headers': {'content-type': 'image/png'}
+            }),
+            log_entry('Network.responseReceived', requestId='inline', response={'url': 'data:image/png;base64,', 'status': 200})
+        ]
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == 'Network.getResponseBody'
+        return self.bodies[params['requestId']]
+
+
+@pytest.fixture
+def proxy(tmp_path):
+    path = str(tmp_path / 'session.zip')
+    recorder = SessionRecorder(path, 'https://meetings.hubspot.com/name/30min')
+    recorder.record_page('2025-03-10', PAGE_URL, StubDriver(), 1.5)
+    recorder.save()
+
+    proxy = ReplayProxy(SessionArchive(path)).start()
+    yield proxy
+    proxy.stop()
+
+
+def fetch_through_proxy(proxy, url):
+    """Fetch like Chrome does with --proxy-server: the full URL in the request line."""
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({'http': f'http://{proxy.address}'}))
+    return opener.open(url).read()
+
+
+def fetch_https_through_proxy(proxy, url, method='GET', headers=None):
+    """Fetch an HTTPS URL through a CONNECT tunnel, accepting the proxy's self-signed certificate."""
+    opener = urllib.request.build_opener(
+        urllib.request.ProxyHandler({'https': f'http://{proxy.address}'}),
+        urllib.request.HTTPSHandler(context=ssl._create_unverified_context())
+    )
+    return opener.open(urllib.request.Request(url, method=method, headers=headers or {}))
+
+
+def test_archive_round_trip(proxy):
+    assert proxy.archive.pages[0]['date'] == '2025-03-10'
+    assert proxy.archive.pages[0]['load_seconds'] == 1.5
+    assert len(proxy.archive.responses) == 4
+    status, headers, body = proxy.archive.response('GET', 'https://static.hsappstatic.net/logo.png')
+    assert (status, body) == (200, LOGO_BYTES)
+
+
+def test_recorded_responses_replayed_over_https(proxy):
+    response = fetch_https_through_proxy(proxy, PAGE_URL)
+    assert response.read() == PAGE_SOURCE.encode()
+    # Bodies are stored decoded, so the recorded encoding must not be replayed
+    assert response.headers['Content-Encoding'] is None
+
+    response = fetch_https_through_proxy(proxy, API_URL)
+    assert json.loads(response.read()) == {'slots': ['9:00 am']}
+    assert response.headers['Access-Control-Allow-Origin'] == 'https://meetings.hubspot.com'
+    assert response.headers.get_all('Set-Cookie') == ['a=1', 'b=2']
+
+
+def test_changed_query_falls_back_to_path(proxy):
+    response = fetch_https_through_proxy(proxy, API_URL.replace('1700000000', '1800000000'))
+    assert response.read() == API_BODY
+
+
+def test_redirects_are_replayed(proxy):
+    # urllib follows the recorded redirect to the recorded image
+    response = fetch_https_through_proxy(proxy, 'https://static.hsappstatic.net/old-logo.png')
+    assert response.url == 'https://static.hsappstatic.net/logo.png'
+    assert response.read() == LOGO_BYTES
+
+
+def test_cors_preflight_allowed(proxy):
+    response = fetch_https_through_proxy(proxy, API_URL, method='OPTIONS', headers={
+        'Origin': 'https://meetings.hubspot.com',
+        'Access-Control-Request-Method': 'POST'
+    })
+    assert response.status == 204
+    assert response.headers['Access-Control-Allow-Origin'] == 'https://meetings.hubspot.com'
+    assert response.headers['Access-Control-Allow-Methods'] == 'POST'
+
+
+def test_snapshot_served_directly(proxy):
+    assert urllib.request.urlopen(proxy.page_url(PAGE_URL)).read() == REPLAYED_HTML
+
+
+def test_snapshot_served_through_proxy(proxy):
+    assert fetch_through_proxy(proxy, proxy.page_url(PAGE_URL)) == REPLAYED_HTML
+
+
+def test_unrecorded_requests_are_not_found(proxy):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch_through_proxy(proxy, 'http://static.hsappstatic.net/app.js')
+    assert error.value.code == 404
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch_through_proxy(proxy, proxy.page_url('https://meetings.hubspot.com/other'))
+    assert error.value.code == 404
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch_https_through_proxy(proxy, 'https://api.hubspot.com/other')
+    assert error.value.code == 404
+    assert proxy.missed == 3